@@ -1,23 +1,42 @@
-<<<<<<< HEAD
 # =====================================================
 # IMPORT LIBRARIES
 # =====================================================
 import streamlit as st
 import pandas as pd
 import numpy as np
-import altair as alt
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from dataclasses import dataclass, asdict, fields
+from datetime import datetime
+import hashlib
+import io
 import os
 
 # -----------------------------------------------------
 # Optional: ReportLab for PDF Invoice
 # -----------------------------------------------------
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.pdfgen import canvas
-    REPORTLAB_AVAILABLE = True
-except Exception:
-    REPORTLAB_AVAILABLE = False
+# st.cache_resource, not functools.cache: Streamlit re-executes this script on
+# every rerun, which would rebuild a functools cache along with the function.
+@st.cache_resource(show_spinner=False)
+def get_reportlab():
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+        return canvas, A4, True
+    except Exception:
+        return None, None, False
+
+
+REPORTLAB_AVAILABLE = get_reportlab()[2]
+
+
+# -----------------------------------------------------
+# Altair for Charts (imported on first chart build)
+# -----------------------------------------------------
+@st.cache_resource(show_spinner=False)
+def get_altair():
+    import altair as alt
+    return alt
 
 
 # =====================================================
@@ -28,9 +47,39 @@ st.set_page_config(page_title="Gold Shop & Price Tool", layout="wide")
 os.makedirs("invoices", exist_ok=True)
 os.makedirs("exports", exist_ok=True)
 
+# ---- Transaction Record ----
+@dataclass(slots=True)
+class Transaction:
+    bill_no: str
+    item: str
+    carat: int
+    grams: float
+    gold_value: float
+    making_charge: float
+    gst: float
+    final_price: float
+    timestamp: str
+
+
+# ---- Transactions Table Schema ----
+# Arrow-backed columns let st.dataframe and the CSV export skip a conversion.
+# money stays float64: float32 loses paise precision above ~₹1.3 lakh
+TX_DTYPES = {
+    "bill_no": "string[pyarrow]",
+    "item": "string[pyarrow]",
+    "carat": "int8[pyarrow]",
+    "grams": "float32[pyarrow]",
+    "gold_value": "float64[pyarrow]",
+    "making_charge": "float64[pyarrow]",
+    "gst": "float64[pyarrow]",
+    "final_price": "float64[pyarrow]",
+    "timestamp": "string[pyarrow]",
+}
+
 # ---- Session State Safe Init ----
-if "transactions" not in st.session_state:
-    st.session_state["transactions"] = []
+# tx_df is kept newest-first, so it never needs re-sorting
+if "tx_df" not in st.session_state:
+    st.session_state["tx_df"] = pd.DataFrame(columns=list(TX_DTYPES)).astype(TX_DTYPES)
 
 if "bill_counter" not in st.session_state:
     st.session_state["bill_counter"] = 0
@@ -42,35 +91,40 @@ if "last_bill" not in st.session_state:
 # =====================================================
 # DARK MODE
 # =====================================================
+# Must be emitted on every run: Streamlit drops elements a rerun doesn't redraw.
+CSS_DARK = """
+<style>
+.main { background-color: #0e1117; color: #e6eef6; }
+</style>
+"""
+
+
 def inject_dark_mode(dark: bool):
     if dark:
-        st.markdown(
-            """
-            <style>
-            .main { background-color: #0e1117; color: #e6eef6; }
-            </style>
-            """,
-            unsafe_allow_html=True
-        )
+        st.markdown(CSS_DARK, unsafe_allow_html=True)
 
 
 # =====================================================
 # PURITY MAPPING
 # =====================================================
 PURITY = {24: 0.999, 22: 0.916, 20: 0.833, 18: 0.750}
+CARAT_FACTOR = {k: v / PURITY[24] for k, v in PURITY.items()}
 
 
 # =====================================================
 # HISTORICAL PRICE (SIMULATED)
 # =====================================================
-def simulate_historical(base_rate_24k, days=90, volatility=0.01):
-    dates = [datetime.today() - timedelta(days=i) for i in range(days)][::-1]
-    price = base_rate_24k
-    prices = []
-
-    for _ in range(days):
-        price *= (1 + np.random.normal(0, volatility))
-        prices.append(max(price, 1000))
+@st.cache_data(show_spinner=False, ttl=24 * 60 * 60, max_entries=32)
+def simulate_historical(base_rate_24k, days=90, volatility=0.01,
+                        seed: int = datetime.today().toordinal()):
+    # seed changes once a day, so reruns on the same day hit the cache
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq="D")
+    # single buffer: shocks -> growth factors -> prices, all in place
+    prices = np.random.default_rng(seed).normal(0.0, volatility, days)
+    prices += 1.0
+    np.cumprod(prices, out=prices)
+    prices *= base_rate_24k
+    np.maximum(prices, 1000.0, out=prices)
 
     return pd.DataFrame({"date": dates, "price_24k": prices})
 
@@ -79,7 +133,7 @@ def simulate_historical(base_rate_24k, days=90, volatility=0.01):
 # PRICE CONVERSION
 # =====================================================
 def price_for_carat(price_24k, carat):
-    return price_24k * (PURITY[carat] / PURITY[24])
+    return price_24k * CARAT_FACTOR[carat]
 
 
 # =====================================================
@@ -94,9 +148,16 @@ def generate_bill_number():
 # =====================================================
 # PDF INVOICE
 # =====================================================
-def generate_invoice_pdf(bill):
-    path = f"invoices/{bill['bill_no']}.pdf"
-    c = canvas.Canvas(path, pagesize=A4)
+LABELS = {f.name: f.name.replace("_", " ").title() for f in fields(Transaction)}
+
+
+# process-wide cache: sized for one pending bill per concurrent session
+@st.cache_data(show_spinner=False, max_entries=128, ttl=60 * 60)
+def invoice_pdf_bytes(bill_items):
+    bill = dict(bill_items)
+    canvas, A4, _ = get_reportlab()
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4)
     w, h = A4
 
     y = h - 50
@@ -104,14 +165,73 @@ def generate_invoice_pdf(bill):
     c.drawString(50, y, "GOLD SHOP INVOICE")
 
     y -= 40
-    c.setFont("Helvetica", 10)
-    for k, v in bill.items():
-        c.drawString(50, y, f"{k.replace('_',' ').title()}: {v}")
-        y -= 18
+    to = c.beginText(50, y)
+    to.setFont("Helvetica", 10)
+    to.setLeading(18)
+    to.textLines("\n".join(f"{LABELS[k]}: {bill[k]}" for k in LABELS))
+    c.drawText(to)
 
     c.showPage()
     c.save()
-    return path
+    return buf.getvalue()
+
+
+def invoice_pdf_path(bill_items):
+    # bill counters restart with each session, so the content digest keeps
+    # two different bills with the same bill_no from sharing a file
+    digest = hashlib.sha1(repr(bill_items).encode()).hexdigest()[:10]
+    return f"invoices/{dict(bill_items)['bill_no']}-{digest}.pdf"
+
+
+def archive_invoice_pdf(bill):
+    bill_items = tuple(asdict(bill).items())
+    path = invoice_pdf_path(bill_items)
+    if os.path.exists(path):
+        return
+
+    with open(path, "wb") as f:
+        f.write(invoice_pdf_bytes(bill_items))
+
+
+def load_invoice_pdf(bill_items):
+    # archived copy first, so a bill evicted from the RAM cache isn't re-rendered
+    path = invoice_pdf_path(bill_items)
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return f.read()
+    return invoice_pdf_bytes(bill_items)
+
+
+# =====================================================
+# CSV EXPORT
+# =====================================================
+@st.cache_data(show_spinner=False, max_entries=8)
+def tx_csv_bytes(df):
+    buf = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
+
+
+# =====================================================
+# HISTORICAL CHART
+# =====================================================
+# _hist is not hashed; hist_key (raw price bytes) identifies the series
+@st.cache_resource(show_spinner=False, max_entries=16)
+def build_hist_chart(_hist, hist_key, carat):
+    alt = get_altair()
+    long = _hist.melt(
+        id_vars="date",
+        # dict.fromkeys drops the duplicate column when carat is 24
+        value_vars=list(dict.fromkeys(["price_24k", f"price_{carat}k"])),
+        var_name="key",
+        value_name="value"
+    )
+    return (
+        alt.Chart(long)
+        .mark_line()
+        .encode(x="date:T", y="value:Q", color="key:N")
+        .properties(height=250)
+    )
 
 
 # =====================================================
@@ -138,7 +258,9 @@ col_left, col_right = st.columns([2, 1])
 # =====================================================
 # LEFT COLUMN
 # =====================================================
-with col_left:
+# Each column is a fragment, so interacting with one does not rerun the other.
+@st.fragment
+def calculator_panel():
 
     st.header("Gold Price Calculator")
 
@@ -170,264 +292,82 @@ with col_left:
 
         bill_no = generate_bill_number()
 
-        st.session_state["last_bill"] = {
-            "bill_no": bill_no,
-            "item": item_name,
-            "carat": carat,
-            "grams": grams,
-            "gold_value": round(gold_value, 2),
-            "making_charge": round(making_charge, 2),
-            "gst": round(gst_amount, 2),
-            "final_price": round(final_price, 2),
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M")
-        }
+        st.session_state["last_bill"] = Transaction(
+            bill_no=bill_no,
+            item=item_name,
+            carat=carat,
+            grams=grams,
+            gold_value=round(gold_value, 2),
+            making_charge=round(making_charge, 2),
+            gst=round(gst_amount, 2),
+            final_price=round(final_price, 2),
+            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M")
+        )
 
         st.metric("Final Bill (₹)", f"{final_price:,.2f}")
         st.write(f"Invoice No: **{bill_no}**")
 
     # ---------- SAVE + PDF ----------
     if shop_mode and st.session_state["last_bill"]:
-        if st.button("💾 Save Transaction"):
-            st.session_state["transactions"].append(st.session_state["last_bill"])
+        if st.session_state.pop("tx_saved", False):
             st.success("Transaction Saved")
 
+        if st.button("💾 Save Transaction"):
+            st.session_state["tx_df"] = pd.concat(
+                [pd.DataFrame([asdict(st.session_state["last_bill"])]).astype(TX_DTYPES),
+                 st.session_state["tx_df"]],
+                ignore_index=True
+            )
+            if REPORTLAB_AVAILABLE:
+                archive_invoice_pdf(st.session_state["last_bill"])
+            # full rerun so the dashboard fragment picks up the new row
+            st.session_state["tx_saved"] = True
+            st.rerun()
+
         if REPORTLAB_AVAILABLE:
-            pdf = generate_invoice_pdf(st.session_state["last_bill"])
-            with open(pdf, "rb") as f:
-                st.download_button("📄 Download Invoice", f, file_name=os.path.basename(pdf))
+            bill_items = tuple(asdict(st.session_state["last_bill"]).items())
+            bill = st.session_state["last_bill"]
+            # a callable defers rendering until the button is clicked
+            st.download_button(
+                "📄 Download Invoice",
+                data=lambda: load_invoice_pdf(bill_items),
+                file_name=f"{bill.bill_no}.pdf",
+                mime="application/pdf"
+            )
+
+    # ---------- HISTORICAL PRICE ----------
+    st.subheader("Historical Price (Simulated)")
+    hist = simulate_historical(manual_24k, seed=datetime.today().toordinal())
+    hist[f"price_{carat}k"] = hist["price_24k"] * CARAT_FACTOR.get(carat, carat / 24.0 / PURITY[24])
+    st.altair_chart(
+        build_hist_chart(hist, hist["price_24k"].to_numpy().tobytes(), carat),
+        width="stretch"
+    )
+
+
+with col_left:
+    calculator_panel()
 
 
 # =====================================================
 # RIGHT COLUMN
 # =====================================================
-with col_right:
+@st.fragment
+def dashboard_panel():
 
     st.header("Shop Dashboard")
 
-    if st.session_state["transactions"]:
-        df = pd.DataFrame(st.session_state["transactions"])
-        st.dataframe(df.sort_values("timestamp", ascending=False))
+    tx_df = st.session_state["tx_df"]
+    if not tx_df.empty:
+        st.dataframe(tx_df)
         st.download_button(
             "Download CSV",
-            df.to_csv(index=False).encode(),
+            tx_csv_bytes(tx_df),
             "transactions.csv"
         )
     else:
         st.info("No transactions saved yet.")
-=======
-# =====================================================
-# IMPORT LIBRARIES
-# =====================================================
-import streamlit as st
-import pandas as pd
-import numpy as np
-import altair as alt
-from datetime import datetime, timedelta
-import os
-
-# -----------------------------------------------------
-# Optional: ReportLab for PDF Invoice
-# -----------------------------------------------------
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.pdfgen import canvas
-    REPORTLAB_AVAILABLE = True
-except Exception:
-    REPORTLAB_AVAILABLE = False
-
-
-# =====================================================
-# APP CONFIGURATION
-# =====================================================
-st.set_page_config(page_title="Gold Shop & Price Tool", layout="wide")
-
-os.makedirs("invoices", exist_ok=True)
-os.makedirs("exports", exist_ok=True)
-
-# ---- Session State Safe Init ----
-if "transactions" not in st.session_state:
-    st.session_state["transactions"] = []
-
-if "bill_counter" not in st.session_state:
-    st.session_state["bill_counter"] = 0
-
-if "last_bill" not in st.session_state:
-    st.session_state["last_bill"] = None
-
-
-# =====================================================
-# DARK MODE
-# =====================================================
-def inject_dark_mode(dark: bool):
-    if dark:
-        st.markdown(
-            """
-            <style>
-            .main { background-color: #0e1117; color: #e6eef6; }
-            </style>
-            """,
-            unsafe_allow_html=True
-        )
-
-
-# =====================================================
-# PURITY MAPPING
-# =====================================================
-PURITY = {24: 0.999, 22: 0.916, 20: 0.833, 18: 0.750}
-
-
-# =====================================================
-# HISTORICAL PRICE (SIMULATED)
-# =====================================================
-def simulate_historical(base_rate_24k, days=90, volatility=0.01):
-    dates = [datetime.today() - timedelta(days=i) for i in range(days)][::-1]
-    price = base_rate_24k
-    prices = []
-
-    for _ in range(days):
-        price *= (1 + np.random.normal(0, volatility))
-        prices.append(max(price, 1000))
-
-    return pd.DataFrame({"date": dates, "price_24k": prices})
-
-
-# =====================================================
-# PRICE CONVERSION
-# =====================================================
-def price_for_carat(price_24k, carat):
-    return price_24k * (PURITY[carat] / PURITY[24])
-
-
-# =====================================================
-# BILL NUMBER
-# =====================================================
-def generate_bill_number():
-    st.session_state["bill_counter"] += 1
-    today = datetime.now().strftime("%Y%m%d")
-    return f"INV-{today}-{st.session_state['bill_counter']:04d}"
-
-
-# =====================================================
-# PDF INVOICE
-# =====================================================
-def generate_invoice_pdf(bill):
-    path = f"invoices/{bill['bill_no']}.pdf"
-    c = canvas.Canvas(path, pagesize=A4)
-    w, h = A4
-
-    y = h - 50
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y, "GOLD SHOP INVOICE")
-
-    y -= 40
-    c.setFont("Helvetica", 10)
-    for k, v in bill.items():
-        c.drawString(50, y, f"{k.replace('_',' ').title()}: {v}")
-        y -= 18
-
-    c.showPage()
-    c.save()
-    return path
-
-
-# =====================================================
-# SIDEBAR
-# =====================================================
-st.sidebar.header("Settings")
-
-dark_mode = st.sidebar.checkbox("Dark Mode")
-inject_dark_mode(dark_mode)
-
-manual_24k = st.sidebar.number_input(
-    "Manual 24K Rate (₹/gram)", 1000.0, 20000.0, 6000.0
-)
-
-shop_mode = st.sidebar.checkbox("Enable Shop Mode", value=True)
-
-
-# =====================================================
-# MAIN LAYOUT
-# =====================================================
-col_left, col_right = st.columns([2, 1])
-
-
-# =====================================================
-# LEFT COLUMN
-# =====================================================
-with col_left:
-
-    st.header("Gold Price Calculator")
-
-    with st.form("calc_form"):
-        carat = st.selectbox("Carat", [24, 22, 20, 18], index=1)
-        grams = st.number_input("Weight (grams)", 0.01, value=10.0)
-        item_name = st.text_input("Item Name", "Gold Ring")
-        making_type = st.radio("Making Charge Type", ["% of gold value", "₹ per gram"])
-        making_val = st.number_input("Making Value", 0.0, value=2.0)
-        wastage_percent = st.number_input("Wastage (%)", 0.0, value=0.0)
-        hallmark_charge = st.number_input("Hallmark Charge (₹)", 0.0, value=50.0)
-        gst = st.number_input("GST (%)", 0.0, value=3.0)
-        submitted = st.form_submit_button("Calculate")
-
-    if submitted:
-        rate_per_g = price_for_carat(manual_24k, carat)
-        effective_grams = grams * (1 + wastage_percent / 100)
-        gold_value = rate_per_g * effective_grams
-
-        making_charge = (
-            gold_value * making_val / 100
-            if making_type == "% of gold value"
-            else making_val * effective_grams
-        )
-
-        pre_tax = gold_value + making_charge + hallmark_charge
-        gst_amount = pre_tax * gst / 100
-        final_price = pre_tax + gst_amount
-
-        bill_no = generate_bill_number()
-
-        st.session_state["last_bill"] = {
-            "bill_no": bill_no,
-            "item": item_name,
-            "carat": carat,
-            "grams": grams,
-            "gold_value": round(gold_value, 2),
-            "making_charge": round(making_charge, 2),
-            "gst": round(gst_amount, 2),
-            "final_price": round(final_price, 2),
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M")
-        }
-
-        st.metric("Final Bill (₹)", f"{final_price:,.2f}")
-        st.write(f"Invoice No: **{bill_no}**")
-
-    # ---------- SAVE + PDF ----------
-    if shop_mode and st.session_state["last_bill"]:
-        if st.button("💾 Save Transaction"):
-            st.session_state["transactions"].append(st.session_state["last_bill"])
-            st.success("Transaction Saved")
-
-        if REPORTLAB_AVAILABLE:
-            pdf = generate_invoice_pdf(st.session_state["last_bill"])
-            with open(pdf, "rb") as f:
-                st.download_button("📄 Download Invoice", f, file_name=os.path.basename(pdf))
-
-
-# =====================================================
-# RIGHT COLUMN
-# =====================================================
-with col_right:
-
-    st.header("Shop Dashboard")
-
-    if st.session_state["transactions"]:
-        df = pd.DataFrame(st.session_state["transactions"])
-        st.dataframe(df.sort_values("timestamp", ascending=False))
-        st.download_button(
-            "Download CSV",
-            df.to_csv(index=False).encode(),
-            "transactions.csv"
-        )
-    else:
-        st.info("No transactions saved yet.")
->>>>>>> 2f4fe33 (Added assets and screenshots)
+
+
+with col_right:
+    dashboard_panel()